@@ -1,34 +1,82 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, Query
 from typing import List, Optional
 from datetime import datetime
-from src.schemas.schemas import ArticleEntry
+from src.schemas.schemas import ArticleEntry, ArticleEntryList
 from src.persistence.database import DataPersistence
 from src.persistence.factory import get_database
-from src.core import get_topics
+from src.persistence.mongo.connection import (
+    close_mongo_connection,
+    connect_to_mongo,
+    get_mongo_client,
+)
+from pymongo.errors import PyMongoError
+from src.core import TOPICS
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the Mongo connection at startup, so the first request does not pay
+    # for the server discovery and the connection handshake. The persistence layer
+    # does not keep the client, so it uses this connection and the one opened by a
+    # later startup in the same process. It runs in a worker thread because the
+    # settings are loaded from Prefect with a blocking call.
+    await asyncio.to_thread(connect_to_mongo)
+    try:
+        await asyncio.to_thread(get_mongo_client().admin.command, "ping")
+    except PyMongoError as e:
+        logger.warning(f"MongoDB is not reachable at startup: {e}")
+    yield
+    close_mongo_connection()
+
 
 app = FastAPI(
     title="News API",
     description="API for fetching news articles by topic.",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.mount("/static", StaticFiles(directory="src/api/html/static"), name="static")
 
-# CORS (optional; same-origin usually fine). Adjust origins if necessary.
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # tighten in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS is only needed when the API is consumed from another origin; the bundled
+# frontend is served by this app. Set CORS_ORIGINS (comma separated) to enable it.
+_cors_origins = os.environ.get("CORS_ORIGINS")
+if _cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[origin.strip() for origin in _cors_origins.split(",")],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 data_persistence: DataPersistence = get_database()  # You may need to adjust this
 
+# Topics are static, so their JSON payload is encoded only once.
+_TOPICS_JSON = orjson.dumps(TOPICS)
+
+# Maximum number of articles returned by a single request
+MAX_ARTICLES_LIMIT = 100
+
+# The articles only change when the pipeline runs, so the encoded responses
+# are kept for a short time to avoid a Mongo round-trip on every request.
+# The cache is sized by the bytes of the responses, not by their number.
+_NEWS_CACHE_TTL_SECONDS = 60
+_NEWS_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_news_cache = TTLCache(maxsize=_NEWS_CACHE_MAX_BYTES, ttl=_NEWS_CACHE_TTL_SECONDS, getsizeof=len)
+
 
 @app.get("/", include_in_schema=False)
 async def root_page():
@@ -36,36 +84,53 @@ async def root_page():
     return FileResponse("src/api/html/index.html")
 
 
-@app.get("/api/get_topics", response_model=List[str])
+@app.get("/api/get_topics", response_model=None, responses={200: {"model": List[str]}})
 async def api_get_topics():
-    return get_topics()
+    return Response(content=_TOPICS_JSON, media_type="application/json")
 
 
-@app.get("/api/get_news_by_topic", response_model=List[ArticleEntry], tags=["news"])
-def api_get_news_by_topic(
+# The articles are serialized in one batch below, so the response model is only
+# declared for the OpenAPI schema and FastAPI does not validate it a second time.
+@app.get(
+    "/api/get_news_by_topic",
+    response_model=None,
+    responses={200: {"model": List[ArticleEntry]}},
+    tags=["news"],
+)
+async def api_get_news_by_topic(
     topics: List[str] = Query([], description="List of topics to filter articles"),
-    limit: int = Query(10, description="Number of articles to return"),
+    limit: int = Query(10, ge=1, le=MAX_ARTICLES_LIMIT, description="Number of articles to return"),
     from_date: Optional[datetime] = Query(None, description="Start date for articles"),
     to_date: Optional[datetime] = Query(None, description="End date for articles"),
     sort_by_match: bool = Query(False, description="Order by topic match"),
 ):
-    articles = data_persistence.get_matching_articles(
-        topics=topics,
-        from_date=from_date,
-        to_date=to_date,
-        sort_by_match=sort_by_match,
-        limit=limit,
-    )
-    return [article.model_dump() for article in articles]
+    # Topics are matched as a set, so their order and duplicates do not change the result
+    cache_key = (tuple(sorted(set(topics))), from_date, to_date, sort_by_match, limit)
+    content = _news_cache.get(cache_key)
+    if content is None:
+        # The persistence layer is synchronous; run it in a worker thread so the
+        # event loop keeps serving other requests during the Mongo round-trip.
+        articles = await asyncio.to_thread(
+            data_persistence.get_matching_articles,
+            topics=topics,
+            from_date=from_date,
+            to_date=to_date,
+            sort_by_match=sort_by_match,
+            limit=limit,
+        )
+        # orjson encodes the datetimes natively, so the python-mode dump is enough
+        content = orjson.dumps(ArticleEntryList.dump_python(articles))
+        _news_cache[cache_key] = content
+    return Response(content=content, media_type="application/json")
 
 
 # Health check endpoint
 @app.get("/health", tags=["system"])
-def health():
+async def health():
     return {"status": "ok"}
 
 
 # Root endpoint
 @app.get("/", tags=["system"])
-def root():
+async def root():
     return {"message": "Welcome to Dentu News API. Use /get_news_by_topic to fetch articles."}
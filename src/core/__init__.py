@@ -1,4 +1,11 @@
-from .topic_dictionary import get_topics, get_keywords, get_all_keywords
+from .topic_dictionary import TOPICS, classify, get_topics, get_keywords, get_all_keywords
 from .config import get_settings
 
-__all__ = ["get_topics", "get_keywords", "get_all_keywords", "get_settings"]
+__all__ = [
+    "TOPICS",
+    "classify",
+    "get_topics",
+    "get_keywords",
+    "get_all_keywords",
+    "get_settings",
+]
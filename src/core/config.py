@@ -2,6 +2,7 @@
 Configuration settings for the application.
 """
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from prefect.blocks.core import Block
 from pydantic import BaseModel
@@ -48,6 +49,7 @@ class BlockSettings(SystemConfiguration, Block):
     pass
 
 
+@lru_cache(maxsize=1)
 def get_settings():
     """
     Get the application settings.
@@ -55,15 +57,24 @@ def get_settings():
     This implementation follows a singleton pattern where
     the settings are loaded once and reused. It warranties that only
     one settings instance is created and used.
+
+    The Prefect block is only saved when it does not exist yet,
+    so the remote call happens once, not on every process start.
+
+    The block is always loaded and saved synchronously: inside an async flow, Prefect
+    would otherwise return coroutines, which are never awaited here and the loaded one
+    would be kept by the cache for the whole process.
     """
 
-    if not hasattr(get_settings, "settings"):
+    try:
+        return BlockSettings.load("system-settings", _sync=True)
+    except Exception:
+        print("No block settings. Setting to default")
+        settings = LocalSettings()
+        block_settings = BlockSettings(**settings.model_dump())
         try:
-            get_settings.settings = BlockSettings.load("system-settings")
-        except Exception:
-            print("No block settings. Setting to default")
-            get_settings.settings = LocalSettings()
-            block_settings = BlockSettings(**get_settings.settings.model_dump())
-            block_settings.save("system-settings", overwrite=True)
-
-    return get_settings.settings
+            block_settings.save("system-settings", overwrite=False, _sync=True)
+        except ValueError:
+            # Another process created the block in the meantime, keep it.
+            pass
+        return settings
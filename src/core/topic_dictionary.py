@@ -1,5 +1,6 @@
-from typing import List
-import random
+from itertools import chain
+from typing import List, Tuple
+import ahocorasick
 
 TOPIC_KEYWORDS = {
     "ai": [
@@ -200,12 +201,75 @@ TOPIC_KEYWORDS = {
     ],
 }
 
+# Topics and keywords never change at runtime, so they are computed once at import time.
+TOPICS: Tuple[str, ...] = tuple(TOPIC_KEYWORDS.keys())
+ALL_KEYWORDS: Tuple[str, ...] = tuple(chain.from_iterable(TOPIC_KEYWORDS.values()))
 
-def get_topics() -> List[str]:
+
+def _build_keyword_automaton() -> ahocorasick.Automaton:
+    """
+    Build an Aho-Corasick automaton with the keywords of all the topics.
+
+    Each lowercase keyword maps to its length and the indexes in TOPICS of the
+    topics it belongs to, so a single scan of a text finds the matches of every topic.
+    """
+    keyword_topics = {}
+    for topic_index, keywords in enumerate(TOPIC_KEYWORDS.values()):
+        for keyword in keywords:
+            if keyword:
+                keyword_topics.setdefault(keyword.lower(), []).append(topic_index)
+
+    automaton = ahocorasick.Automaton()
+    for keyword, topic_indexes in keyword_topics.items():
+        automaton.add_word(keyword, (len(keyword), tuple(topic_indexes)))
+    automaton.make_automaton()
+    return automaton
+
+
+KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def _is_word_char(char: str) -> bool:
     """
-    Returns a list of all topics.
+    Returns True if the character is a word character (letter, digit or underscore).
+    """
+    return char.isalnum() or char == "_"
+
+
+def classify(text: str) -> List[int]:
     """
-    return list(TOPIC_KEYWORDS.keys())
+    Counts the keyword matches of each topic in a lowercase text.
+
+    The text is scanned once regardless of the number of keywords.
+    Only whole words are matched, e.g. "ai" does not match inside "said".
+
+    Args:
+        text (str): The lowercase text to classify.
+
+    Returns:
+        List[int]: The number of keyword matches per topic, in the order of TOPICS.
+    """
+    scores = [0] * len(TOPICS)
+    if not text:
+        return scores
+
+    last = len(text) - 1
+    for end, (length, topic_indexes) in KEYWORD_AUTOMATON.iter(text):
+        start = end - length + 1
+        if start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if end < last and _is_word_char(text[end + 1]):
+            continue
+        for topic_index in topic_indexes:
+            scores[topic_index] += 1
+    return scores
+
+
+def get_topics() -> Tuple[str, ...]:
+    """
+    Returns all the topics.
+    """
+    return TOPICS
 
 
 def get_keywords(topic: str) -> List[str]:
@@ -219,10 +283,4 @@ def get_all_keywords() -> List[str]:
     """
     Returns a list of all keywords across all topics.
     """
-    keywords = []
-    for topic in TOPIC_KEYWORDS.values():
-        keywords.extend(topic)
-
-    random.shuffle(keywords)  # Shuffle to avoid bias in keyword order
-
-    return keywords
+    return list(ALL_KEYWORDS)
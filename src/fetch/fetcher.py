@@ -19,7 +19,7 @@ class Fetcher(ABC):
         pass
 
     @abstractmethod
-    def fetch_data(
+    async def fetch_data(
         self,
         keywords: List[str] = [],
         from_date: datetime = None,
@@ -3,13 +3,21 @@ News API Fetcher implementation.
 """
 
 from src.fetch.fetcher import Fetcher
-from src.schemas import ArticleEntry
+from src.schemas import ArticleEntry, ArticleEntryList
 from datetime import datetime
 from typing import List
-import requests
+from urllib.parse import urlencode
+import asyncio
+import re
+import httpx
+import orjson
 from src.core.config import get_settings
 from prefect import get_run_logger
 
+# News API adds at the end of the truncated content the remaining size as
+# ".. [+XXXX chars]"
+_TRUNCATED_CHARS_RE = re.compile(r"\[\+(\d+) chars\]\s*$")
+
 
 class NewsApiFetcher(Fetcher):
     """
@@ -28,7 +36,14 @@ class NewsApiFetcher(Fetcher):
     # We set a lower limit to allow for other URL parameters.
     MAX_KEYWORDS_QUERY_CHARS = 400
 
+    # HTTP client configuration. The client keeps the connections alive
+    # so every request made during a fetch reuses them.
+    HTTP_TIMEOUT = 30
+    HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20)
+
     def __init__(self, **kwargs):
+        # The fetcher is passed to the fetch task, so it doesn't keep a run logger;
+        # each public method gets the logger of the current run and passes it on.
         logger = get_run_logger()
         settings = get_settings()
         self.api_key = settings.news_api_key.get_secret_value()
@@ -37,73 +52,100 @@ class NewsApiFetcher(Fetcher):
             raise ValueError("News API key not found in settings.")
         logger.info("NewsApiFetcher initialized successfully")
 
-    def _create_request_url(
-        self, keywords: List[str], from_date: datetime, to_date: datetime
-    ) -> str:
+    def _partition_keywords(self, keywords: List[str]) -> List[str]:
+        """
+        Split the keywords into OR-queries that fit in the query length limit.
+
+        Args:
+            keywords (List[str]): A list of keywords to search for.
+
+        Returns:
+            List[str]: The keyword queries, each one under MAX_KEYWORDS_QUERY_CHARS.
+        """
+        # Keep the length of the query being built instead of concatenating
+        # and measuring a new string for every keyword.
+        separator = " OR "
+        budget = self.MAX_KEYWORDS_QUERY_CHARS - len("&q=")
+        queries = []
+        terms = []
+        used = 0
+        for keyword in keywords:
+            # Currently all keywords are treated as OR conditions
+            # [TODO: investigate how to implement more complex conditions]
+            term = f"'{keyword}'"
+            extra = len(term) + (len(separator) if terms else 0)
+            if terms and used + extra >= budget:
+                # Start a new query instead of dropping the remaining keywords
+                queries.append(separator.join(terms))
+                terms = []
+                used = 0
+                extra = len(term)
+            terms.append(term)
+            used += extra
+        if terms:
+            queries.append(separator.join(terms))
+
+        return queries
+
+    def _create_request_urls(
+        self, keywords: List[str], from_date: datetime, to_date: datetime, logger
+    ) -> List[str]:
         """
-        Create the request URL for the News API.
+        Create the request URLs for the News API.
+
+        The News API limits the length of the keyword query, so the keywords
+        are split in several queries and one URL is created for each one.
 
         Args:
             keywords (List[str]): A list of keywords to search for.
             from_date (datetime): The start date for the search.
             to_date (datetime): The end date for the search.
+            logger: The run logger.
 
         Returns:
-            str: The constructed request URL.
+            List[str]: The constructed request URLs.
         """
-        logger = get_run_logger()
 
         # Construct the base URL. To simplify we only get english articles
         # ordered by popularity. [TODO: set language and order mode as parameters]
-        url = f"{self.BASE_URL}?apiKey={self.api_key}&language=en&sortBy=popularity"
-        keyword_query = ""
+        params = {"apiKey": self.api_key, "language": "en", "sortBy": "popularity"}
 
         #  Dates should be in ISO 8601 format without UTC timezone and millisecond
         if from_date:
-            url += f"&from={from_date.strftime('%Y-%m-%dT%H:%M:%S')}"
+            params["from"] = from_date.replace(tzinfo=None).isoformat(timespec="seconds")
             logger.info(f"Added from_date filter: {from_date}")
         if to_date:
-            url += f"&to={to_date.strftime('%Y-%m-%dT%H:%M:%S')}"
+            params["to"] = to_date.replace(tzinfo=None).isoformat(timespec="seconds")
             logger.info(f"Added to_date filter: {to_date}")
 
-        if len(keywords) > 0:
-            # Ensure we don't exceed the maximum query length
-            keyword_query = f"&q='{keywords[0]}'"
-            for keyword in keywords[1:]:
-                # Currently all keywords are treated as OR conditions
-                # [TODO: investigate how to implement more complex conditions]
-                tmp_query = keyword_query + f" OR '{keyword}'"
-                if len(tmp_query) >= self.MAX_KEYWORDS_QUERY_CHARS:
-                    logger.warning(
-                        f"Keyword query truncated at {self.MAX_KEYWORDS_QUERY_CHARS} characters"
-                    )
-                    break
-                keyword_query = tmp_query
-
-        if len(keywords) > 0:
-            url += keyword_query
-            logger.info(f"Created request URL with {len(keywords)} keywords")
-        else:
+        url = f"{self.BASE_URL}?{urlencode(params)}"
+
+        keyword_queries = self._partition_keywords(keywords)
+        if not keyword_queries:
             logger.info("Created request URL without keyword filters")
-        return url
+            return [url]
+
+        logger.info(f"Created {len(keyword_queries)} request URLs with {len(keywords)} keywords")
+        return [f"{url}&{urlencode({'q': keyword_query})}" for keyword_query in keyword_queries]
 
-    def _fetch_content(self, url: str) -> dict:
+    async def _fetch_content(self, client: httpx.AsyncClient, url: str, logger) -> dict:
         """
         Fetch content from the News API.
 
         Args:
+            client (httpx.AsyncClient): The HTTP client used to send the request.
             url (str): The request URL for the News API.
+            logger: The run logger.
 
         Returns:
             dict: The JSON response from the API or an error message.
         """
 
-        logger = get_run_logger()
         logger.info("Fetching content from News API")
-        response = requests.get(url)
+        response = await client.get(url)
         logger.info(f"Received response with status code: {response.status_code}")
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             logger.info(f"Successfully fetched {data.get('totalResults', 0)} total results")
             return data
         else:
@@ -128,17 +170,49 @@ class NewsApiFetcher(Fetcher):
             int: The estimated size of the full content.
         """
 
-        size = len(content_head.encode("utf-8"))
+        # For ASCII text the byte size is the number of characters,
+        # so the encoded copy is only needed for non-ASCII content.
+        if content_head.isascii():
+            size = len(content_head)
+        else:
+            size = len(content_head.encode("utf-8"))
 
-        # News API adds at the end the full size as
-        # ".. [+XXXX chars]"
-        if content_head.endswith("]"):
-            try:
-                size += int(content_head.split("[+")[-1].split(" ")[0])
-            except (ValueError, IndexError):
-                pass
+        match = _TRUNCATED_CHARS_RE.search(content_head)
+        if match:
+            size += int(match.group(1))
         return size
 
+    def _to_article_row(self, item: dict) -> dict:
+        """
+        Map a raw News API article to the ArticleEntry fields.
+
+        Args:
+            item (dict): A raw article from the API response.
+
+        Returns:
+            dict: The article data, ready to be validated as an ArticleEntry.
+        """
+
+        # Convert ISO datetime to datetime object
+        published_at_str = item.get("publishedAt", None)
+        published_at = None
+        if published_at_str:
+            # Since Python 3.11 fromisoformat parses the 'Z' (Zulu time i.e UTC+00:00)
+            # suffix itself, so the string is passed as is.
+            published_at = datetime.fromisoformat(published_at_str)
+
+        content = item.get("content") or ""
+        return {
+            "author": item.get("author") or "",
+            "title": item.get("title") or "",
+            "description": item.get("description") or "",
+            "url": item.get("url") or "",
+            "published_at": published_at,
+            "content_head": content,
+            "content_size": self._get_content_size(content),
+            "source": (item.get("source") or {}).get("name") or "",
+        }
+
     def parse_articles(self, data: dict) -> List[ArticleEntry]:
         """
         Parse articles from the API response.
@@ -150,31 +224,13 @@ class NewsApiFetcher(Fetcher):
             List[ArticleEntry]: A list of parsed articles.
         """
         logger = get_run_logger()
-        articles = []
         raw_articles = data.get("articles", [])
         logger.info(f"Parsing {len(raw_articles)} articles from API response")
 
-        for i, item in enumerate(raw_articles):
-            logger.debug(f"Processing article {i + 1}/{len(raw_articles)}")
-
-            # Convert ISO datetime to datetime object
-            published_at_str = item.get("publishedAt", None)
-            published_at = None
-            if published_at_str:
-                # The 'Z' indicates Zulu time i.e UTC+00:00
-                published_at = datetime.fromisoformat(published_at_str.replace("Z", "+00:00"))
-
-            article = ArticleEntry(
-                author=item.get("author") or "",
-                title=item.get("title") or "",
-                description=item.get("description") or "",
-                url=item.get("url") or "",
-                published_at=published_at,
-                content_head=item.get("content") or "",
-                content_size=self._get_content_size(item.get("content") or ""),
-                source=item.get("source", {}).get("name") or "",
-            )
-            articles.append(article)
+        # Validate all the articles in one call instead of once per article
+        articles = ArticleEntryList.validate_python(
+            [self._to_article_row(item) for item in raw_articles]
+        )
 
         if not articles:
             logger.error("No articles found in the response data")
@@ -183,7 +239,7 @@ class NewsApiFetcher(Fetcher):
         logger.info(f"Successfully parsed {len(articles)} articles")
         return articles
 
-    def fetch_data(
+    async def fetch_data(
         self,
         keywords: List[str] = [],
         from_date: datetime = None,
@@ -198,13 +254,31 @@ class NewsApiFetcher(Fetcher):
             to_date (datetime, optional): The end date for the articles.
 
         Returns:
-            dict: The raw API response data.
+            dict: The raw API response data. When several requests are needed,
+                their articles are merged and deduplicated by URL.
         """
 
         logger = get_run_logger()
         logger.info(f"Starting data fetch with {len(keywords)} keywords")
 
-        url = self._create_request_url(keywords, from_date, to_date)
-        raw_data = self._fetch_content(url)
+        urls = self._create_request_urls(keywords, from_date, to_date, logger)
+        async with httpx.AsyncClient(
+            http2=True, timeout=self.HTTP_TIMEOUT, limits=self.HTTP_LIMITS
+        ) as client:
+            responses = await asyncio.gather(
+                *[self._fetch_content(client, url, logger) for url in urls]
+            )
+
+        # The same article may match the keywords of several queries
+        articles = {}
+        for response in responses:
+            for article in response.get("articles", []):
+                articles.setdefault(article.get("url"), article)
+
+        raw_data = {
+            "status": "ok",
+            "totalResults": sum(response.get("totalResults", 0) for response in responses),
+            "articles": list(articles.values()),
+        }
         logger.info("Data fetch completed successfully")
         return raw_data
@@ -8,65 +8,24 @@ from src.process import process_data
 from src.core import get_topics
 from prefect import flow, task, get_run_logger
 from datetime import datetime, timedelta
+import asyncio
 from typing import List
-from src.schemas import ArticleEntry
 
 
-@task
-def get_keywords_from_topics() -> List[str]:
-    """Get all available topics as keywords."""
-    logger = get_run_logger()
-    topics = get_topics()
-    logger.info(f"Retrieved {len(topics)} topics as keywords: {topics}")
-    return topics
-
-
-@task
-def fetch_news_data(fetcher, keywords: List[str], from_date: datetime, to_date: datetime) -> dict:
+# The HTTP fetch is the only step that benefits from Prefect's retries, so it is
+# the only one kept as a task; the other steps run directly in the flow.
+@task(retries=3, retry_delay_seconds=[1, 5, 15])
+async def fetch_news_data(
+    fetcher, keywords: List[str], from_date: datetime, to_date: datetime
+) -> dict:
     """Task to fetch raw news data."""
     logger = get_run_logger()
     logger.info(f"Fetching data with keywords: {keywords}")
-    return fetcher.fetch_data(keywords=keywords, from_date=from_date, to_date=to_date)
-
-
-@task
-def parse_news_articles(fetcher, raw_data: dict):
-    """Task to parse articles from raw data."""
-    logger = get_run_logger()
-    logger.info("Parsing articles from raw data")
-    return fetcher.parse_articles(raw_data)
-
-
-@task
-def process_articles_task(parsed_articles) -> list[ArticleEntry]:
-    """Task to process articles."""
-    logger = get_run_logger()
-    if parsed_articles:
-        logger.info(f"Processing {len(parsed_articles)} articles")
-        return process_data(parsed_articles)
-    else:
-        logger.info("No parsed articles")
-        return []
-
-
-@task
-def store_articles_task(articles) -> int:
-    """Task to store articles in the database."""
-    logger = get_run_logger()
-    if articles:
-        logger.info(f"Storing {len(articles)} articles in database")
-        db = get_database()
-        db.store_articles(articles)
-        stored_count = len(articles)
-        logger.info(f"Successfully stored {stored_count} articles")
-        return stored_count
-    else:
-        logger.warning("No articles to store")
-        return 0
+    return await fetcher.fetch_data(keywords=keywords, from_date=from_date, to_date=to_date)
 
 
 @flow(name="news_pipeline_flow")
-def news_pipeline_flow(hours_back: int = 24):
+async def news_pipeline_flow(hours_back: int = 24):
     """
     Simplified news data pipeline flow that runs every N hours.
 
@@ -94,19 +53,32 @@ def news_pipeline_flow(hours_back: int = 24):
         logger.info("Initializing fetcher and database")
         fetcher = get_fetcher()
 
-        # Get keywords from topics
-        keywords = get_keywords_from_topics()
+        # Get all available topics as keywords
+        keywords = get_topics()
+        logger.info(f"Retrieved {len(keywords)} topics as keywords: {keywords}")
 
         # Fetch and process data
-        raw_data = fetch_news_data(fetcher, keywords, from_date, to_date)
+        raw_data = await fetch_news_data(fetcher, keywords, from_date, to_date)
 
-        parsed_articles = parse_news_articles(fetcher, raw_data)
+        logger.info("Parsing articles from raw data")
+        parsed_articles = fetcher.parse_articles(raw_data)
 
         logger.info(f"Processing and enriching {len(parsed_articles)} articles")
-        enriched_articles = process_articles_task(parsed_articles)
-
-        # Store articles using task
-        stored_count = store_articles_task(enriched_articles)
+        enriched_articles = process_data(parsed_articles) if parsed_articles else []
+
+        # Store articles
+        stored_count = 0
+        if enriched_articles:
+            logger.info(f"Storing {len(enriched_articles)} articles in database")
+            database = get_database()
+            # The indexes are created here, by the writer, so the API only needs
+            # read access and never runs schema changes while serving requests.
+            database.create_indexes()
+            database.store_articles(enriched_articles)
+            stored_count = len(enriched_articles)
+            logger.info(f"Successfully stored {stored_count} articles")
+        else:
+            logger.warning("No articles to store")
 
         logger.info(
             f"Pipeline completed successfully. Processed {len(parsed_articles)} raw articles, stored {stored_count} enriched articles."
@@ -120,5 +92,5 @@ def news_pipeline_flow(hours_back: int = 24):
 
 if __name__ == "__main__":
     # Example usage - fetch last 12 hours of news (with 24h offset)
-    result = news_pipeline_flow(hours_back=12)
+    result = asyncio.run(news_pipeline_flow(hours_back=12))
     print(f"Pipeline completed: {result} articles stored")
@@ -4,7 +4,7 @@ Base class for data persistence layer.
 
 from abc import ABC, abstractmethod
 from src.schemas import ArticleEntry
-from typing import List
+from typing import Iterator, List
 from datetime import datetime
 
 
@@ -13,6 +13,16 @@ class DataPersistence(ABC):
     Abstract base class for data persistence layer.
     """
 
+    @abstractmethod
+    def create_indexes(self):
+        """
+        Create the indexes used by the article queries, if they don't exist.
+
+        It is not called by the read and write methods; it should be called
+        by the process that writes the articles, before storing them.
+        """
+        pass
+
     @abstractmethod
     def store_articles(self, articles: List[ArticleEntry]):
         """
@@ -23,6 +33,23 @@ class DataPersistence(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_articles(self, order_by_date=True, limit=0) -> Iterator[ArticleEntry]:
+        """
+        Iterate over the articles of the persistence layer, one at a time.
+
+        Unlike get_all_articles, the articles are not loaded all at once,
+        so it is suited for large results.
+
+        Args:
+            order_by_date (bool): Whether to order articles by date.
+            limit (int): The maximum number of articles to return, 0 for no limit.
+
+        Returns:
+            Iterator[ArticleEntry]: The articles.
+        """
+        pass
+
     @abstractmethod
     def get_all_articles(self, order_by_date=True, limit=10) -> List[ArticleEntry]:
         """
@@ -2,10 +2,13 @@
 Factory functions for creating persistence layer components.
 """
 
+from functools import lru_cache
+
 from src.persistence.database import DataPersistence
 from src.persistence.mongo.mongo_database import MongoDataPersistence
 
 
+@lru_cache(maxsize=1)
 def get_database() -> DataPersistence:
     """
     Create a database instance for the persistence layer.
@@ -15,6 +18,9 @@ def get_database() -> DataPersistence:
     implemented.
     [TODO: Implement other DataPersistence implementations]
 
+    The instance is created once per process and shared by every caller.
+    It does not hold the Mongo client, which is owned by the connection module.
+
     Returns:
         DataPersistence: The database instance.
     """
@@ -7,6 +7,16 @@ This module provides functions for establishing and closing MongoDB connections.
 from pymongo import MongoClient
 from src.core.config import get_settings, LocalSettings
 
+# Connection pool settings. The pool is shared by all the threads of the
+# process (e.g. the API worker threads), so it keeps some connections open.
+MAX_POOL_SIZE = 50
+MIN_POOL_SIZE = 5
+SERVER_SELECTION_TIMEOUT_MS = 2000
+
+# Wire protocol compression, in order of preference. The server picks the first one
+# it also supports; zlib is always available, zstd and snappy need the pymongo extras.
+COMPRESSORS = "zstd,snappy,zlib"
+
 # Global variables to store database connection
 _client = None
 _db = None
@@ -39,7 +49,14 @@ def connect_to_mongo():
 
     # Create client if it doesn't exist
     if _client is None:
-        _client = MongoClient(settings.mongo_uri)
+        _client = MongoClient(
+            settings.mongo_uri,
+            maxPoolSize=MAX_POOL_SIZE,
+            minPoolSize=MIN_POOL_SIZE,
+            serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+            compressors=COMPRESSORS,
+            retryWrites=True,
+        )
         _db = _client[settings.mongo_db_name]
 
 
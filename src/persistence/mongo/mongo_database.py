@@ -2,18 +2,35 @@
 MongoDB implementation of the data persistence layer.
 """
 
-from typing import List, Dict, Any
-from pymongo import DESCENDING
-from src.schemas import ArticleEntry
+import logging
+from typing import Any, Dict, Iterator, List
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
+from src.schemas import ArticleEntry, ArticleEntryList
 from datetime import datetime
 
 from src.persistence.database import DataPersistence
 from src.persistence.mongo.connection import (
     get_mongo_db,
     connect_to_mongo,
-    get_mongo_client,
 )
 
+# Only the ArticleEntry fields are sent back by the server, in every find()
+# and as the last stage of the aggregations.
+# The stored documents were validated before being written, so the read paths
+# build the articles with model_construct, which skips the validation.
+ARTICLE_PROJECTION = dict.fromkeys(ArticleEntry.model_fields, 1) | {"_id": 0}
+
+# Number of documents the server sends in each cursor batch
+CURSOR_BATCH_SIZE = 256
+
+# Compound index for the topic queries: topics are matched by equality ($in),
+# then the date is used to sort and filter by range.
+TOPICS_DATE_INDEX = [("topics", ASCENDING), ("published_at", DESCENDING)]
+
+logger = logging.getLogger(__name__)
+
 
 class MongoDataPersistence(DataPersistence):
     """
@@ -22,44 +39,88 @@ class MongoDataPersistence(DataPersistence):
 
     def __init__(self):
         """Initialize MongoDB repository without establishing connection."""
-        connect_to_mongo()
-        self.client = get_mongo_client()
-        self.db = get_mongo_db()
-        self.collection = self.db["docs"]
-
-    def _ensure_connection(self):
-        """Ensure database connection is established."""
-        if self.db is None:
-            self.db = get_mongo_db()
-            if self.db is None:
-                raise RuntimeError(
-                    "MongoDB connection not established. Call connect_to_mongo() first."
-                )
-            self.collection = self.db["docs"]
-
-    def store_articles(self, articles: List[ArticleEntry]):
-        self._ensure_connection()
-        for article in articles:
-            document = article.model_dump()
-            # Use upsert to ensure uniqueness by URL
-            self.collection.update_one(
-                {"url": document["url"]},  # Filter by URL
-                {"$set": document},  # Update/insert the document
-                upsert=True,  # Create if doesn't exist
+        self.collection_name = "docs"
+        self._topics_date_index_found = False
+
+    def create_indexes(self):
+        """
+        Create the indexes used by the article queries, if they don't exist.
+
+        - url: identifies the articles on upserts.
+        - published_at: queries without topics, sorted by date.
+        - topics + published_at (TOPICS_DATE_INDEX): the topics come first because
+          they are matched by equality ($in), then the date which is used to sort
+          and filter by range.
+
+        An index that can't be built is logged and skipped, so the others are still
+        created and the articles can still be stored and read without it.
+        """
+        collection = self._get_collection()
+        indexes = [
+            ([("url", ASCENDING)], {"unique": True}),
+            ([("published_at", DESCENDING)], {}),
+            (TOPICS_DATE_INDEX, {}),
+        ]
+        for keys, options in indexes:
+            try:
+                collection.create_index(keys, **options)
+            except OperationFailure as e:
+                # e.g. the unique url index on a collection that already has duplicated
+                # URLs; the upserts still work, without the uniqueness guarantee.
+                logger.warning(f"Could not create the index {keys}: {e}")
+
+    def _get_collection(self) -> Collection:
+        """
+        Get the articles collection, connecting to MongoDB if needed.
+
+        The client is owned by the connection module and is not kept here, so a
+        client closed and opened again (e.g. on an API restart) is always used.
+        """
+        db = get_mongo_db()
+        if db is None:
+            connect_to_mongo()
+            db = get_mongo_db()
+        return db[self.collection_name]
+
+    def _has_topics_date_index(self, collection: Collection) -> bool:
+        """
+        Check if TOPICS_DATE_INDEX exists, so the topic queries can hint it.
+
+        The server rejects a hint on a missing index instead of falling back to the
+        planner, and the index is only created by the pipeline, so it may not exist yet.
+        Once found it is not checked again.
+        """
+        if not self._topics_date_index_found:
+            self._topics_date_index_found = any(
+                index["key"] == TOPICS_DATE_INDEX
+                for index in collection.index_information().values()
             )
+        return self._topics_date_index_found
 
-    def get_all_articles(self, order_by_date=True, limit=10) -> List[ArticleEntry]:
-        self._ensure_connection()
-        cursor = self.collection.find()
+    def store_articles(self, articles: List[ArticleEntry]):
+        if not articles:
+            return
+
+        # Use upsert to ensure uniqueness by URL. All the upserts are sent in a
+        # single batch; unordered so the server does not stop at the first error.
+        operations = [
+            UpdateOne({"url": document["url"]}, {"$set": document}, upsert=True)
+            for document in ArticleEntryList.dump_python(articles)
+        ]
+        self._get_collection().bulk_write(operations, ordered=False)
+
+    def iter_articles(self, order_by_date=True, limit=0) -> Iterator[ArticleEntry]:
+        cursor = self._get_collection().find({}, ARTICLE_PROJECTION).batch_size(CURSOR_BATCH_SIZE)
         if order_by_date:
             cursor = cursor.sort("published_at", DESCENDING)
         if limit > 0:
             cursor = cursor.limit(limit)
 
-        articles = []
-        for doc in list(cursor):
-            articles.append(ArticleEntry(**doc))
-        return articles
+        for doc in cursor:
+            yield ArticleEntry.model_construct(**doc)
+
+    def get_all_articles(self, order_by_date=True, limit=10) -> List[ArticleEntry]:
+        return list(self.iter_articles(order_by_date=order_by_date, limit=limit))
 
     def get_matching_articles(
         self,
@@ -69,7 +130,7 @@ class MongoDataPersistence(DataPersistence):
         sort_by_match=False,
         limit=10,
     ) -> List[ArticleEntry]:
-        self._ensure_connection()
+        collection = self._get_collection()
 
         query: Dict[str, Any] = {}
         date_filter = {}
@@ -82,39 +143,43 @@ class MongoDataPersistence(DataPersistence):
 
         # If topics is empty, always return all articles ordered by date, regardless of sort_by_match
         if not topics:
-            cursor = self.collection.find(query)
+            cursor = collection.find(query, ARTICLE_PROJECTION).batch_size(CURSOR_BATCH_SIZE)
             cursor = cursor.sort("published_at", DESCENDING)
             if limit > 0:
                 cursor = cursor.limit(limit)
         elif sort_by_match:
             query["topics"] = {"$in": topics}
-            pipeline = []
-            if query:
-                pipeline.append({"$match": query})
-
-            pipeline.extend(
-                [
-                    {
-                        "$addFields": {
-                            "match_count": {"$size": {"$setIntersection": ["$topics", topics]}}
-                        }
-                    },
-                    {"$sort": {"match_count": DESCENDING, "published_at": DESCENDING}},
-                ]
-            )
-
+            # The $match on stored fields must stay the first stage so it can use the
+            # topics + published_at index; match_count is only computed afterwards on
+            # the matching documents. $limit right after $sort lets the server keep
+            # only the top documents while sorting.
+            pipeline = [
+                {"$match": query},
+                {
+                    "$addFields": {
+                        "match_count": {"$size": {"$setIntersection": ["$topics", topics]}}
+                    }
+                },
+                {"$sort": {"match_count": DESCENDING, "published_at": DESCENDING}},
+            ]
             if limit > 0:
                 pipeline.append({"$limit": limit})
+            pipeline.append({"$project": ARTICLE_PROJECTION})
 
-            cursor = self.collection.aggregate(pipeline)
+            cursor = collection.aggregate(pipeline, batchSize=CURSOR_BATCH_SIZE)
         else:
             query["topics"] = {"$in": topics}
-            cursor = self.collection.find(query)
+            # The planner could pick the published_at index to avoid the sort and then
+            # scan most of the collection, so the topics + published_at index is forced
+            # when it exists.
+            # The query can't be covered by the index: the whole article is returned
+            # and topics is an array (multikey) field.
+            cursor = collection.find(query, ARTICLE_PROJECTION).batch_size(CURSOR_BATCH_SIZE)
+            if self._has_topics_date_index(collection):
+                cursor = cursor.hint(TOPICS_DATE_INDEX)
             cursor = cursor.sort("published_at", DESCENDING)
             if limit > 0:
                 cursor = cursor.limit(limit)
 
-        articles = []
-        for doc in list(cursor):
-            articles.append(ArticleEntry(**doc))
-        return articles
+        # The documents are streamed from the cursor instead of loading the whole result first
+        return [ArticleEntry.model_construct(**doc) for doc in cursor]
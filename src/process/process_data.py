@@ -2,204 +2,206 @@
 Helpers to clean and preprocess article data.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 import re
 import requests
-from bs4 import BeautifulSoup
-from src.schemas import ArticleEntry
-from pandas import DataFrame as df
+import requests_cache
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+from src.schemas import ArticleEntry, ArticleEntryList
 from prefect import get_run_logger
-from src.core import get_topics, get_keywords, get_settings
+from src.core import classify, get_topics, get_settings
+from src.core.config import SystemConfiguration
 
+# HTML tags; the negated class matches without the backtracking of a lazy ".*?"
+_HTML_TAG_RE = re.compile(r"<[^>]*>")
 
-def _fetch_text_from_url(url: str) -> str:
+# Text fields that must be present for an article to be kept
+_REQUIRED_TEXT_FIELDS = ("content_head", "title", "author", "description", "url", "source")
+
+# Number of article pages fetched at the same time when GET_FULL_TEXT is enabled
+FETCH_WORKERS = 32
+
+# The pipeline runs every few minutes and finds the same articles again, so the
+# fetched pages are cached on disk (url_cache.sqlite) between runs.
+URL_CACHE_NAME = "url_cache"
+URL_CACHE_EXPIRE_SECONDS = 24 * 60 * 60
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    """
+    Get the HTTP session shared by all the page fetches.
+
+    It is only created the first time a page is fetched, so nothing is opened
+    (including the cache file) when GET_FULL_TEXT is disabled.
+
+    The connection pool is sized to the number of fetch workers,
+    so the connections are reused instead of opened for every page.
+    Responses are cached in a SQLite file, so repeated URLs are not fetched again.
+    """
+    session = requests_cache.CachedSession(
+        URL_CACHE_NAME, backend="sqlite", expire_after=URL_CACHE_EXPIRE_SECONDS
+    )
+    adapter = HTTPAdapter(pool_connections=FETCH_WORKERS, pool_maxsize=FETCH_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Try to avoid simple blocks by adding a user-agent header
+    session.headers["User-Agent"] = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+    )
+    return session
+
+
+def _fetch_text_from_url(url: str, session: requests.Session, logger) -> str:
     """
     Scrap text content from a web page.
     NOTE: This process may be slow and most servers block scraping attempts.
 
     Args:
         url (str): The URL of the web page to scrape.
+        session (requests.Session): The HTTP session used to send the request.
+        logger: The run logger. It is passed explicitly because this function
+            runs in worker threads, where the Prefect run context is not available.
 
     Returns:
         str: The text content of the web page, or None if an error occurred.
     """
 
     try:
-        # Try to avoid simple blocks by adding a user-agent header
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=1)
+        response = session.get(url, timeout=1)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-        return soup.get_text(separator=" ", strip=True)
+        tree = LexborHTMLParser(response.content)
+        if tree.body is None:
+            return ""
+        # Scripts and styles are not part of the readable text
+        tree.strip_tags(["script", "style"])
+        return tree.body.text(separator=" ", strip=True)
     except requests.exceptions.RequestException as e:
-        logger = get_run_logger()
         logger.debug(f"Error fetching URL {url}: {e}")
         return None
 
 
-def _score_keywords(keywords, text) -> int:
+def _fetch_texts_from_urls(urls: list[str], logger) -> list[str]:
     """
-    Score the presence of keywords in the given text.
-    This mechanism uses regular expressions to find whole words only, avoiding partial matches.
+    Scrap the text content of several web pages concurrently.
 
     Args:
-        keywords (list): A list of keywords to search for.
-        text (str): The text to search within.
+        urls (list[str]): The URLs of the web pages to scrape.
+        logger: The run logger.
 
     Returns:
-        int: The score representing the presence of keywords in the text.
-
+        list[str]: The text content of each page, None where an error occurred.
     """
 
-    if not text or not keywords:
-        return 0
-    txt = str(text).lower()
-    total = 0
-    for term in keywords:
-        if not term:
-            continue
-        pat = rf"(?<!\w){re.escape(term.lower())}(?!\w)"  # word-boundary-friendly for phrases
-        total += len(re.findall(pat, txt))
-    return total
+    # The session is created here, before the worker threads share it
+    fetch = partial(_fetch_text_from_url, session=_get_session(), logger=logger)
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        return list(pool.map(fetch, urls))
 
 
-def _raw_articles_to_df(articles: list[ArticleEntry]) -> df:
-    """
-    Convert a list of raw articles to a pandas DataFrame.
-    """
-
-    logger = get_run_logger()
-    logger.info(f"Converting {len(articles)} raw articles to DataFrame")
-    data = [article.model_dump() for article in articles]
-    df_data = df(data)
-    return df_data
-
-
-def _remove_incomplete_articles(articles_df: df) -> df:
+def _remove_incomplete_articles(articles: list[dict]) -> list[dict]:
     """
     Remove articles with missing or incomplete information.
     """
 
     logger = get_run_logger()
-    articles_df = articles_df.dropna().reset_index(drop=True)
 
-    # Remove articles with empty columns
-    articles_df = articles_df[articles_df["content_head"].str.strip() != ""]
-    articles_df = articles_df[articles_df["title"].str.strip() != ""]
-    articles_df = articles_df[articles_df["author"].str.strip() != ""]
-    articles_df = articles_df[articles_df["description"].str.strip() != ""]
-    articles_df = articles_df[articles_df["url"].str.strip() != ""]
-    articles_df = articles_df[articles_df["source"].str.strip() != ""]
+    # All the checks are done in a single pass; isspace() tells blank fields
+    # apart without allocating a stripped copy of each one.
+    articles = [
+        article
+        for article in articles
+        if article["published_at"] is not None
+        and all(article[field] and not article[field].isspace() for field in _REQUIRED_TEXT_FIELDS)
+    ]
 
-    logger.info(f"After removing incomplete articles, remaining articles: {len(articles_df)}")
+    logger.info(f"After removing incomplete articles, remaining articles: {len(articles)}")
 
-    return articles_df
+    return articles
 
 
-def _filter_articles(articles_df: df) -> df:
+def _filter_articles(articles: list[dict], settings: SystemConfiguration) -> list[dict]:
     """
     Filter articles based on content size and title length.
     """
 
     logger = get_run_logger()
-    settings = get_settings()
 
     # Remove all articles with insufficient content size or title length
-    articles_df = articles_df[articles_df["content_size"] >= settings.min_content_size]
-    articles_df = articles_df[articles_df["title"].str.len() >= settings.min_title_size]
+    articles = [
+        article
+        for article in articles
+        if article["content_size"] >= settings.min_content_size
+        and len(article["title"]) >= settings.min_title_size
+    ]
 
-    logger.info(f"After filtering, remaining articles: {len(articles_df)}")
+    logger.info(f"After filtering, remaining articles: {len(articles)}")
 
     # Remove all html tags from content, description and title
-    articles_df["content_head"] = articles_df["content_head"].str.replace(r"<.*?>", "", regex=True)
-    articles_df["description"] = articles_df["description"].str.replace(r"<.*?>", "", regex=True)
-    articles_df["title"] = articles_df["title"].str.replace(r"<.*?>", "", regex=True)
+    for article in articles:
+        for field in ("content_head", "description", "title"):
+            article[field] = _HTML_TAG_RE.sub("", article[field])
 
-    return articles_df
+    return articles
 
 
-def _get_full_text(row):
+def _get_full_texts(articles: list[dict], settings: SystemConfiguration) -> list[str]:
     """
-    Get article text to be evaluated for relevance.
+    Get the text of each article to be evaluated for relevance.
     """
 
-    settings = get_settings()
+    logger = get_run_logger()
+
+    # Fallback to title + description + content_head
+    fallback_texts = [
+        f"{article['title']} {article['description']} {article['content_head']}"
+        for article in articles
+    ]
 
     # Only scrap the URLs if it explicit defined
     if not settings.get_full_text:
-        text = ""
-    else:
-        text = _fetch_text_from_url(row["url"])
+        return fallback_texts
 
-    if text is None or len(text.strip()) == 0:
-        # Fallback to title + description + content_head
-        return f"{row.get('title', '')} {row.get('description', '')} {row.get('content_head', '')}"
-    return text
+    logger.info("Fetching full text content from article URLs")
+    texts = _fetch_texts_from_urls([article["url"] for article in articles], logger)
+
+    # Count articles where text fetching failed
+    fetch_failed = sum(1 for text in texts if not text or not text.strip())
+    if fetch_failed:
+        logger.warning(f"Failed to fetch text for {fetch_failed} articles")
 
+    return [
+        text if text and text.strip() else fallback_text
+        for text, fallback_text in zip(texts, fallback_texts, strict=True)
+    ]
 
-def _classify_articles(articles_df: df) -> df:
+
+def _classify_articles(articles: list[dict], settings: SystemConfiguration) -> list[dict]:
     """
     Classify articles into topics based on their content.
 
     It gives a score to each topic based on the presence of keywords.
     Each topic has a list of related topics to use in the classification.
+    The topics whose score reaches the threshold are set in the article.
     """
     logger = get_run_logger()
-    # Check if required columns exist
-    required_columns = ["url", "title"]
-    missing_columns = [col for col in required_columns if col not in articles_df.columns]
-    if missing_columns:
-        raise ValueError(f"Missing required columns for enrichment: {missing_columns}")
-
-    # Fetch full text content for each article
-    logger.info("Fetching full text content from article URLs")
-    articles_df["full_text"] = articles_df.apply(_get_full_text, axis=1)
-
-    # Count articles where text fetching failed
-    fetch_failed = articles_df["full_text"].str.len() == 0
-    if fetch_failed.any():
-        logger.warning(f"Failed to fetch text for {fetch_failed.sum()} articles")
-
-    # Calculate scores for each topic
-    for topic in get_topics():
-        keywords = get_keywords(topic)
-        column_name = f"{topic}_score"
-        logger.info(f"Calculating scores for topic: {topic}")
-        articles_df[column_name] = articles_df.apply(
-            lambda row: _score_keywords(keywords, f"{row['title']} {row['full_text']}"),
-            axis=1,
-        )
-
-    return articles_df
-
-
-def _df_to_article_entries(articles_df: df) -> list[ArticleEntry]:
-    """
-    Converts a DataFrame to a list of ArticleEntry objects, populating topics based on scores.
-    """
-    article_entries = []
+    threshold = settings.score_threshold
     topics = get_topics()
-    settings = get_settings()
-
-    # Get the original fields from the ArticleEntry model to filter DataFrame columns
-    article_fields = ArticleEntry.model_fields.keys()
 
-    for _, row in articles_df.iterrows():
-        article_topics = []
-        for topic in topics:
-            score_col = f"{topic}_score"
-            if score_col in row and row[score_col] >= settings.score_threshold:
-                article_topics.append(topic)
+    full_texts = _get_full_texts(articles, settings)
 
-        # Create a dictionary with only the fields that belong to ArticleEntry
-        article_data = row.to_dict()
-        filtered_data = {key: article_data[key] for key in article_fields if key in article_data}
-        filtered_data["topics"] = article_topics
+    # Calculate the scores of all topics with a single scan of each article text
+    logger.info("Calculating topic scores")
+    for article, full_text in zip(articles, full_texts, strict=True):
+        scores = classify(f"{article['title']} {full_text}".lower())
+        article["topics"] = [
+            topic for topic, score in zip(topics, scores, strict=True) if score >= threshold
+        ]
 
-        article_entries.append(ArticleEntry(**filtered_data))
-
-    return article_entries
+    return articles
 
 
 def process_data(raw_articles: list[ArticleEntry]) -> list[ArticleEntry]:
@@ -207,11 +209,18 @@ def process_data(raw_articles: list[ArticleEntry]) -> list[ArticleEntry]:
     Run all the filtering and classification steps on the raw articles.
     """
 
-    articles_df = _raw_articles_to_df(raw_articles)
-    if articles_df.empty:
+    logger = get_run_logger()
+    logger.info(f"Processing {len(raw_articles)} raw articles")
+    articles = ArticleEntryList.dump_python(raw_articles)
+    if not articles:
         return []
-    articles_df = _remove_incomplete_articles(articles_df)
-    articles_df = _filter_articles(articles_df)
-    articles_df = _classify_articles(articles_df)
-    article_entries = _df_to_article_entries(articles_df)
-    return article_entries
+
+    # The settings are read once and shared by all the steps
+    settings = get_settings()
+    articles = _remove_incomplete_articles(articles)
+    articles = _filter_articles(articles, settings)
+    articles = _classify_articles(articles, settings)
+
+    # The articles come from validated entries and only their text was cleaned,
+    # so they are built back without validating them again.
+    return [ArticleEntry.model_construct(**article) for article in articles]
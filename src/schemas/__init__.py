@@ -1,3 +1,4 @@
 from .schemas import ArticleEntry
+from .schemas import ArticleEntryList
 
-__all__ = ["ArticleEntry"]
+__all__ = ["ArticleEntry", "ArticleEntryList"]
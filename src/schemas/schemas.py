@@ -2,7 +2,7 @@
 DTO (Data Transfer Object) for article data.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 from typing import List
 
@@ -24,3 +24,8 @@ class ArticleEntry(BaseModel):
     topics: List[str] = Field(
         default_factory=list, description="List of topics associated with the article"
     )
+
+
+# Validates/serializes a whole list of articles in a single call, instead of
+# going through the model once per article.
+ArticleEntryList = TypeAdapter(List[ArticleEntry])
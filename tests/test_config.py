@@ -0,0 +1,48 @@
+"""
+Tests for the settings loading inside Prefect flows.
+"""
+
+import asyncio
+
+import pytest
+from prefect import flow
+from prefect.testing.utilities import prefect_test_harness
+
+from src.core.config import BlockSettings
+from src.core.config import SystemConfiguration
+from src.core.config import get_settings
+
+
+@pytest.fixture(scope="module", autouse=True)
+def prefect_server():
+    with prefect_test_harness():
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_settings_cache():
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@flow
+async def load_settings_async():
+    return get_settings()
+
+
+@flow
+def load_settings_sync():
+    return get_settings()
+
+
+def test_get_settings_in_async_flow():
+    # The first call saves the block, the second one loads it
+    for _ in range(2):
+        get_settings.cache_clear()
+        assert isinstance(asyncio.run(load_settings_async()), SystemConfiguration)
+        assert isinstance(BlockSettings.load("system-settings", _sync=True), BlockSettings)
+
+
+def test_get_settings_in_sync_flow():
+    assert isinstance(load_settings_sync(), SystemConfiguration)
@@ -0,0 +1,44 @@
+"""
+Tests for the keyword query partitioning of the News API fetcher.
+"""
+
+import pytest
+
+from src.core.topic_dictionary import ALL_KEYWORDS
+from src.fetch.fetchers.news_api_fetcher import NewsApiFetcher
+
+
+def _fetcher(max_query_chars: int) -> NewsApiFetcher:
+    # The partitioning doesn't need the API key, so __init__ is skipped
+    fetcher = NewsApiFetcher.__new__(NewsApiFetcher)
+    fetcher.MAX_KEYWORDS_QUERY_CHARS = max_query_chars
+    return fetcher
+
+
+def _split(queries: list[str]) -> list[str]:
+    return [term.strip("'") for query in queries for term in query.split(" OR ")]
+
+
+def test_partition_keywords_without_keywords():
+    assert _fetcher(400)._partition_keywords([]) == []
+
+
+@pytest.mark.parametrize("max_query_chars", [50, 100, 400])
+def test_partition_keywords_keeps_every_keyword_in_order(max_query_chars):
+    keywords = list(ALL_KEYWORDS)
+    queries = _fetcher(max_query_chars)._partition_keywords(keywords)
+    assert _split(queries) == keywords
+
+
+@pytest.mark.parametrize("max_query_chars", [50, 100, 400])
+def test_partition_keywords_fits_the_query_limit(max_query_chars):
+    queries = _fetcher(max_query_chars)._partition_keywords(list(ALL_KEYWORDS))
+    for query in queries:
+        assert len("&q=") + len(query) < max_query_chars
+
+
+def test_partition_keywords_fills_each_query():
+    keywords = ["a" * 5] * 10
+    # Each term is 7 chars ('aaaaa') and the separator 4: 3 terms take 29 chars
+    queries = _fetcher(len("&q=") + 30)._partition_keywords(keywords)
+    assert [len(query.split(" OR ")) for query in queries] == [3, 3, 3, 1]
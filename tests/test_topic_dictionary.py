@@ -0,0 +1,72 @@
+"""
+Tests for the keyword classification of the topic dictionary.
+"""
+
+import re
+
+import pytest
+
+from src.core.topic_dictionary import TOPIC_KEYWORDS
+from src.core.topic_dictionary import TOPICS
+from src.core.topic_dictionary import classify
+
+AI = TOPICS.index("ai")
+
+
+def _regex_scores(text: str) -> list[int]:
+    """Reference scorer: one whole-word regex per keyword."""
+    return [
+        sum(
+            len(re.findall(rf"(?<!\w){re.escape(keyword.lower())}(?!\w)", text))
+            for keyword in keywords
+            if keyword
+        )
+        for keywords in TOPIC_KEYWORDS.values()
+    ]
+
+
+def test_classify_returns_one_score_per_topic():
+    assert classify("") == [0] * len(TOPICS)
+    assert len(classify("nothing to see here")) == len(TOPICS)
+
+
+def test_classify_does_not_match_inside_words():
+    assert classify("she said the plan was fair")[AI] == 0
+
+
+def test_classify_matches_whole_words_at_the_text_edges():
+    assert classify("ai")[AI] == 1
+    assert classify("ai is everywhere, even in ai")[AI] == 2
+
+
+def test_classify_matches_multi_word_keywords():
+    scores = classify("advances in machine learning and deep learning")
+    assert scores[AI] == 2
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["ai_model", "_ai", "ai2", "2ai", "openai"],
+)
+def test_classify_treats_underscores_and_digits_as_word_characters(text):
+    assert classify(text)[AI] == 0
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["(ai)", "ai-driven", "gen-ai.", "'ai'", "ai\nnews"],
+)
+def test_classify_treats_punctuation_as_word_boundaries(text):
+    assert classify(text)[AI] == 1
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "the new large language models said to beat gpt at machine learning",
+        "ai, artificial intelligence and ai_labs: neural networks, neural network",
+        "marketing teams use generative ai for seo and content marketing campaigns",
+    ],
+)
+def test_classify_matches_the_regex_scorer(text):
+    assert classify(text) == _regex_scores(text)